@@ -1,12 +1,167 @@
 import os
-import matplotlib.pyplot as plt
+import struct
+import threading
+import zlib
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import geopandas as gpd
-import rasterio
+import shapely
 from rasterio.plot import show as rioshow
+from PIL import Image
 from shapely import wkt
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from ..mcp import gis_mcp
+from .readers import read_raster, read_vector
+
+try:
+    import fpng
+    HAS_FPNG = True
+except ImportError:
+    HAS_FPNG = False
+
+# create_map draws into one shared Agg figure, built without pyplot so no
+# figure manager or GUI backend is involved; the lock serialises concurrent tool calls.
+_FIG = Figure(figsize=(10, 8), dpi=300)
+FigureCanvasAgg(_FIG)
+_FIG_LOCK = threading.Lock()
+
+
+def _get_axes():
+    """
+    Return the shared figure with a fresh axes for a new map.
+
+    The axes is rebuilt rather than cleared: colorbars shrink and re-anchor
+    it, and clearing would not undo that layout change.
+    """
+    _FIG.clear()
+    return _FIG, _FIG.add_subplot(111)
+
+
+def _coords_to_geometries(data) -> np.ndarray:
+    """
+    Build geometries from one coordinate list or a list of coordinate lists.
+
+    Each coordinate list becomes a Point (1 vertex), LineString (2 vertices)
+    or Polygon (3+ vertices). Geometries of each kind are created in a single
+    vectorized shapely call.
+    """
+    if np.ndim(data[0]) == 0:
+        parts = [[data]]
+    elif np.ndim(data[0][0]) == 0:
+        parts = [data]
+    else:
+        parts = data
+
+    counts = np.array([len(part) for part in parts])
+    coords = np.concatenate([np.asarray(part, dtype="float64") for part in parts])
+    indices = np.repeat(np.arange(len(parts)), counts)
+
+    geoms = np.empty(len(parts), dtype=object)
+    rings = np.empty(len(parts), dtype=object)
+    for mask, build, out in (
+        (counts == 1, shapely.points, geoms),
+        (counts == 2, shapely.linestrings, geoms),
+        (counts > 2, shapely.linearrings, rings),
+    ):
+        if mask.any():
+            selected = mask[indices]
+            build(coords[selected], indices=indices[selected], out=out)
+    polygons = counts > 2
+    if polygons.any():
+        geoms[polygons] = shapely.polygons(rings[polygons])
+    return geoms
+
+
+def _simplify_for_display(gdf: gpd.GeoDataFrame, ax, dpi: int, extent=None) -> gpd.GeoDataFrame:
+    """
+    Drop vertices closer together than half an output pixel; point layers are left as is.
+
+    Features that would simplify away entirely (smaller than about a pixel)
+    keep their original geometry so they still draw.
+    """
+    if gdf.empty or gdf.geom_type.isin(["Point", "MultiPoint"]).all():
+        return gdf
+    xmin, ymin, xmax, ymax = extent if extent is not None else gdf.total_bounds
+    position = ax.get_position()
+    width_px = position.width * ax.figure.get_figwidth() * dpi
+    height_px = position.height * ax.figure.get_figheight() * dpi
+    tolerance = max((xmax - xmin) / width_px, (ymax - ymin) / height_px) / 2
+    if not tolerance > 0:
+        return gdf
+    simplified = gdf.geometry.simplify(tolerance, preserve_topology=False)
+    simplified = simplified.where(~simplified.is_empty, gdf.geometry)
+    return gdf.set_geometry(simplified)
+
+
+def _render_rgba(fig, dpi: int, pad_inches: float = 0.1) -> Optional[np.ndarray]:
+    """
+    Draw the figure at the given dpi and return its RGBA pixels cropped to the tight bbox.
+
+    Returns None when the tight bbox reaches outside the figure (e.g. a long
+    title or an outside legend); the canvas does not hold those pixels, so the
+    caller has to fall back to savefig(bbox_inches="tight").
+    """
+    fig.set_dpi(dpi)
+    fig.canvas.draw()
+    tight = fig.get_tightbbox(fig.canvas.get_renderer())
+    fig_width, fig_height = fig.get_size_inches()
+    eps = 1e-6
+    if tight.x0 < -eps or tight.y0 < -eps or tight.x1 > fig_width + eps or tight.y1 > fig_height + eps:
+        return None
+    bbox = tight.padded(pad_inches)
+    rgba = np.asarray(fig.canvas.buffer_rgba())
+    height, width = rgba.shape[:2]
+    x0 = max(int(np.floor(bbox.x0 * dpi)), 0)
+    x1 = min(int(np.ceil(bbox.x1 * dpi)), width)
+    y0 = max(height - int(np.ceil(bbox.y1 * dpi)), 0)
+    y1 = min(height - int(np.floor(bbox.y0 * dpi)), height)
+    return np.ascontiguousarray(rgba[y0:y1, x0:x1])
+
+
+def _with_png_dpi(png: bytes, dpi: int) -> bytes:
+    """Insert a pHYs chunk after IHDR so the PNG records its dpi (fpng writes none)."""
+    ppm = int(dpi / 0.0254 + 0.5)
+    body = b"pHYs" + struct.pack(">IIB", ppm, ppm, 1)
+    chunk = struct.pack(">I", 9) + body + struct.pack(">I", zlib.crc32(body))
+    ihdr_end = 8 + 8 + 13 + 4  # signature, IHDR length/type, IHDR data, CRC
+    return png[:ihdr_end] + chunk + png[ihdr_end:]
+
+
+def _save_figure(fig, output_path: str, filetype: str, dpi: int, compress_level: int) -> None:
+    """
+    Write the figure to output_path.
+
+    PNG and JPEG are encoded from a single Agg draw cropped to the tight bbox,
+    instead of savefig(bbox_inches="tight"), which lays the figure out once to
+    measure it and then draws it again. When content reaches outside the canvas
+    the crop would cut it off, so those maps and vector formats go through
+    savefig, with the same encoder settings.
+    """
+    filetype = filetype.lower()
+    if filetype not in ("png", "jpg", "jpeg"):
+        fig.savefig(output_path, dpi=dpi, bbox_inches="tight")
+        return
+
+    rgba = _render_rgba(fig, dpi=dpi)
+    if rgba is None:
+        if filetype == "png":
+            pil_kwargs = {"compress_level": compress_level, "optimize": False}
+        else:
+            pil_kwargs = {"quality": 85, "optimize": False, "progressive": False}
+        fig.savefig(output_path, dpi=dpi, bbox_inches="tight", pil_kwargs=pil_kwargs)
+    elif filetype == "png" and HAS_FPNG and compress_level <= 3:
+        with open(output_path, "wb") as f:
+            f.write(_with_png_dpi(fpng.from_ndarray(rgba), dpi))
+    elif filetype == "png":
+        Image.fromarray(rgba).save(
+            output_path, "PNG", compress_level=compress_level, optimize=False, dpi=(dpi, dpi)
+        )
+    else:
+        Image.fromarray(rgba[..., :3]).save(
+            output_path, "JPEG", quality=85, optimize=False, progressive=False, dpi=(dpi, dpi)
+        )
 
 
 @gis_mcp.tool()
@@ -17,77 +172,96 @@ def create_map(
     title: str = None,
     show_grid: bool = True,
     add_legend: bool = True,
-    output_dir: str = "outputs"
+    output_dir: str = "outputs",
+    compress_level: int = 3,
+    simplify: bool = True,
+    extent: List[float] = None
 ) -> Dict[str, Any]:
     """
     Create a styled map from multiple inputs (vectors, rasters, WKT, or coords).
 
     Args:
         layers: List of dicts, each containing "data" and "style".
-            data can be: file path (.shp, .geojson, .tif), WKT string, coords, or GeoDataFrame
+            data can be: file path (.shp, .geojson, .tif), WKT string, coords, a list
+            of coordinate lists (one geometry each), or GeoDataFrame
         filename: Output filename (without extension).
         filetype: png, pdf, jpg...
         title: Optional map title.
         show_grid: Draw a grid.
         add_legend: Add legend if labels are provided.
         output_dir: Directory to save output.
+        compress_level: PNG zlib compression level (0-9). Lower is faster;
+            use 6 or higher for smaller files. When fpng is installed, levels
+            up to 3 are written with fpng instead; the dpi is recorded either way.
+        simplify: Simplify line and polygon layers to the output resolution
+            before drawing. Removed vertices would be under half a pixel apart.
+        extent: Optional [xmin, ymin, xmax, ymax] view in the data's CRS. Vector
+            files are read and GeoDataFrames drawn only for features
+            intersecting it; rasters are read whole and only cropped by the view.
     """
     try:
-        fig, ax = plt.subplots(figsize=(10, 8))
+        with _FIG_LOCK:
+            fig, ax = _get_axes()
 
-        for layer in layers:
-            data = layer.get("data")
-            style = layer.get("style", {})
-            label = style.pop("label", None) 
+            for layer in layers:
+                data = layer.get("data")
+                style = layer.get("style", {})
+                label = style.pop("label", None) 
 
-            gdf = None
+                gdf = None
 
-            if isinstance(data, str):
-                data = os.path.abspath(data)
+                if isinstance(data, str):
+                    data = os.path.abspath(data)
 
-                if data.lower().endswith(".shp") or data.lower().endswith(".geojson"):
-                    gdf = gpd.read_file(data)
-                elif data.lower().endswith(".tif"):
-                    with rasterio.open(data) as src:
-                        rioshow(src, ax=ax, **style)
+                    if data.lower().endswith(".shp") or data.lower().endswith(".geojson"):
+                        gdf = read_vector(
+                            data,
+                            # Any string style value may name a column (column=, markersize=,
+                            # ...); names that are not columns are ignored by the reader.
+                            columns=[v for v in style.values() if isinstance(v, str)],
+                            bbox=extent,
+                        )
+                    elif data.lower().endswith(".tif"):
+                        max_size = int(max(fig.get_size_inches()) * 300)
+                        arr, transform = read_raster(data, max_size=max_size)
+                        rioshow(arr, transform=transform, ax=ax, **style)
                         continue
-                else:
-                    geom = wkt.loads(data)
-                    gdf = gpd.GeoDataFrame(geometry=[geom], crs="EPSG:4326")
-
-            elif isinstance(data, gpd.GeoDataFrame):
-                gdf = data
-
-            elif isinstance(data, list):
-                from shapely.geometry import Polygon, LineString, Point
-                if len(data) > 2:
-                    geom = Polygon(data)
-                elif len(data) == 2:
-                    geom = LineString(data)
-                else:
-                    geom = Point(data)
-                gdf = gpd.GeoDataFrame(geometry=[geom], crs="EPSG:4326")
-
-            if gdf is not None:
-                if "column" in style: 
-                    column = style.pop("column")
-                    gdf.plot(ax=ax, column=column, **style, label=label)
-                else:
-                    gdf.plot(ax=ax, **style, label=label)
-
-        if title:
-            ax.set_title(title, fontsize=14)
-        if show_grid:
-            ax.grid(True, linestyle="--", alpha=0.5)
-        if add_legend:
-            handles, labels = ax.get_legend_handles_labels()
-            if labels:
-                ax.legend()
-
-        os.makedirs(output_dir, exist_ok=True)
-        output_path = os.path.abspath(os.path.join(output_dir, f"{filename}.{filetype}"))
-        plt.savefig(output_path, dpi=300, bbox_inches="tight")
-        plt.close(fig)
+                    else:
+                        geom = wkt.loads(data)
+                        gdf = gpd.GeoDataFrame(geometry=[geom], crs="EPSG:4326")
+
+                elif isinstance(data, gpd.GeoDataFrame):
+                    gdf = data
+                    if extent is not None:
+                        gdf = gdf.cx[extent[0]:extent[2], extent[1]:extent[3]]
+
+                elif isinstance(data, list):
+                    gdf = gpd.GeoDataFrame(geometry=_coords_to_geometries(data), crs="EPSG:4326")
+
+                if gdf is not None:
+                    if simplify:
+                        gdf = _simplify_for_display(gdf, ax, dpi=300, extent=extent)
+                    if "column" in style: 
+                        column = style.pop("column")
+                        gdf.plot(ax=ax, column=column, **style, label=label)
+                    else:
+                        gdf.plot(ax=ax, **style, label=label)
+
+            if extent is not None:
+                ax.set_xlim(extent[0], extent[2])
+                ax.set_ylim(extent[1], extent[3])
+            if title:
+                ax.set_title(title, fontsize=14)
+            if show_grid:
+                ax.grid(True, linestyle="--", alpha=0.5)
+            if add_legend:
+                handles, labels = ax.get_legend_handles_labels()
+                if labels:
+                    ax.legend()
+
+            os.makedirs(output_dir, exist_ok=True)
+            output_path = os.path.abspath(os.path.join(output_dir, f"{filename}.{filetype}"))
+            _save_figure(fig, output_path, filetype, dpi=300, compress_level=compress_level)
 
         return {
             "status": "success",
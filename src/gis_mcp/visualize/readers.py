@@ -0,0 +1,115 @@
+"""Cached file readers shared by the visualization tools."""
+import os
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import geopandas as gpd
+import rasterio
+from rasterio.crs import CRS
+from rasterio.enums import ColorInterp, MaskFlags, Resampling
+from rasterio.vrt import WarpedVRT
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+
+@lru_cache(maxsize=32)
+def _read_vector_cached(
+    path: str, mtimes: tuple, columns: Optional[tuple], bbox: Optional[tuple]
+) -> gpd.GeoDataFrame:
+    return gpd.read_file(
+        path,
+        engine="pyogrio",
+        use_arrow=HAS_ARROW,
+        columns=list(columns) if columns is not None else None,
+        bbox=bbox,
+    )
+
+
+@lru_cache(maxsize=4)
+def _read_raster_cached(path: str, mtime: float, max_size: Optional[int], crs: Optional[str]):
+    with rasterio.open(path) as src:
+        if crs is not None and src.crs is None:
+            raise ValueError(f"Raster {path} has no CRS, so it cannot be reprojected to {crs}")
+        if crs is not None and src.crs != CRS.from_user_input(crs):
+            # Without nodata or a mask the warp fills its border with opaque 0s;
+            # an alpha band lets the masked read drop them.
+            add_alpha = all(MaskFlags.all_valid in flags for flags in src.mask_flag_enums)
+            with WarpedVRT(src, crs=crs, resampling=Resampling.bilinear, add_alpha=add_alpha) as vrt:
+                return _read_display(vrt, max_size)
+        return _read_display(src, max_size)
+
+
+def _read_display(src, max_size: Optional[int]):
+    indexes = _display_indexes(src)
+    scale = 1.0
+    if max_size and max(src.width, src.height) > max_size:
+        scale = max_size / max(src.width, src.height)
+    if scale == 1.0:
+        return src.read(indexes, masked=True), src.transform
+
+    height = max(int(round(src.height * scale)), 1)
+    width = max(int(round(src.width * scale)), 1)
+    out_shape = (height, width) if isinstance(indexes, int) else (len(indexes), height, width)
+    # Decimated reads let GDAL serve the data from the closest overview, if any.
+    arr = src.read(indexes, out_shape=out_shape, resampling=Resampling.average, masked=True)
+    transform = src.transform * src.transform.scale(src.width / width, src.height / height)
+    return arr, transform
+
+
+def _display_indexes(src):
+    """Pick the bands rasterio.plot.show would display: RGB by color interpretation, else band 1."""
+    if src.count > 1:
+        lookup = dict(zip(src.colorinterp, src.indexes))
+        try:
+            return [lookup[ci] for ci in (ColorInterp.red, ColorInterp.green, ColorInterp.blue)]
+        except KeyError:
+            pass
+    return 1
+
+
+def _vector_mtimes(path: str) -> tuple:
+    """Modification times of a vector file and, for shapefiles, the sidecars holding its attributes and CRS."""
+    paths = [path]
+    base, ext = os.path.splitext(path)
+    if ext.lower() == ".shp":
+        for sidecar in (".dbf", ".shx", ".prj", ".cpg"):
+            paths.extend((base + sidecar, base + sidecar.upper()))
+    return tuple(os.path.getmtime(p) if os.path.exists(p) else None for p in paths)
+
+
+def read_vector(
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    bbox: Optional[Sequence[float]] = None,
+) -> gpd.GeoDataFrame:
+    """
+    Read a vector file, reusing the parsed GeoDataFrame while the file (and, for
+    shapefiles, its .dbf/.shx/.prj/.cpg sidecars) is unchanged.
+
+    Reads go through pyogrio, using the Arrow stream when pyarrow is installed.
+    If columns is given, only those attribute columns (plus geometry) are read.
+    If bbox (minx, miny, maxx, maxy, in the file's CRS) is given, only features
+    intersecting it are read, using the file's spatial index when it has one.
+    Returns a copy so callers may modify it freely.
+    """
+    columns = tuple(columns) if columns is not None else None
+    bbox = tuple(bbox) if bbox is not None else None
+    return _read_vector_cached(path, _vector_mtimes(path), columns, bbox).copy()
+
+
+def read_raster(path: str, max_size: Optional[int] = None, crs: Optional[str] = None):
+    """
+    Read the displayable band(s) of a raster, cached while the file is unchanged.
+
+    If max_size is given, rasters larger than max_size pixels on their longest
+    side are read downsampled (from overviews when the file has them).
+    If crs is given, the raster is warped to it on the fly; rasters without a
+    CRS then raise ValueError.
+    Returns a (masked array, affine transform) tuple. The array is shared
+    between calls and must not be modified in place.
+    """
+    return _read_raster_cached(path, os.path.getmtime(path), max_size, crs)
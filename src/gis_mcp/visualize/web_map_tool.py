@@ -1,9 +1,19 @@
 import os
+import base64
+import gzip
+import io
+import string
+from concurrent.futures import ThreadPoolExecutor
 import folium
 import geopandas as gpd
+import numpy as np
+from PIL import Image
+from rasterio.transform import array_bounds
+from rasterio.warp import transform_bounds
 from shapely import wkt
-from matplotlib import cm, colors
+from matplotlib import cm, colors, colormaps
 from ..mcp import gis_mcp
+from .readers import read_raster, read_vector
 
 try:
     from folium.plugins import ScaleBar, MiniMap
@@ -12,6 +22,113 @@ except ImportError:
     from folium.plugins import MiniMap
     HAS_SCALEBAR = False
 
+# Longest side, in pixels, of the image embedded for a raster layer.
+RASTER_MAX_SIZE = 2048
+# Upper bound on threads reading layer files concurrently.
+MAX_READ_WORKERS = 8
+
+_LEGEND_HEAD = """
+            <div style="
+                position: fixed; 
+                bottom: 50px; left: 50px; width: 220px; 
+                background-color: white; 
+                border:2px solid grey; 
+                z-index:9999; 
+                font-size:14px;
+                padding: 10px;
+                max-height: 300px;
+                overflow-y: auto;
+            ">
+            <b>Legend</b><br>
+            """
+_LEGEND_ROW_TPL = string.Template(
+    "<i style='background:$color;width:18px;height:18px;float:left;margin-right:8px;'></i>$label<br>"
+)
+_LEGEND_TAIL = "</div>"
+
+_TITLE_TPL = string.Template("""
+                <div id="mapTitle" style="
+                    position: fixed;
+                    top: 10px;
+                    left: 50%;
+                    transform: translateX(-50%);
+                    z-index: 9999;
+                    font-size: 20px;
+                    font-weight: bold;
+                    background-color: rgba(255, 255, 255, 0.7);
+                    padding: 5px 10px;
+                    border-radius: 5px;
+                    text-align: center;
+                ">
+                    $title
+                </div>
+            """)
+
+
+def _to_geojson(gdf: gpd.GeoDataFrame) -> str:
+    """Serialize a layer once to a WGS84 GeoJSON string for folium.GeoJson."""
+    if gdf.crs is not None and not gdf.crs.equals("EPSG:4326"):
+        gdf = gdf.to_crs("EPSG:4326")
+    return gdf.to_json(default=str)
+
+
+def _read_layer_file(layer: dict, tooltip_fields, bbox):
+    """
+    Read the file behind a layer, if it has one.
+
+    Rasters are read from their overviews where available and warped to Web
+    Mercator; vector files are read with only the columns the map needs.
+    Returns None for WKT strings and in-memory layers.
+    """
+    data = layer.get("data")
+    if not isinstance(data, str):
+        return None
+    path = os.path.abspath(data)
+    style = layer.get("style", {})
+    if path.lower().endswith((".tif", ".tiff")):
+        return read_raster(path, max_size=RASTER_MAX_SIZE, crs="EPSG:3857")
+    if path.lower().endswith((".shp", ".geojson")):
+        columns = [style["column"]] if "column" in style else tooltip_fields
+        return read_vector(path, columns=columns, bbox=bbox)
+    return None
+
+
+def _raster_overlay(arr, transform, style: dict, label: str) -> folium.raster_layers.ImageOverlay:
+    """
+    Build an image overlay from a raster read in Web Mercator.
+
+    Warping to Web Mercator up front means the embedded PNG lines up with the
+    basemap without further reprojection in the browser. Single-band rasters
+    are coloured with style["cmap"]; masked pixels are transparent.
+    """
+    mask = np.ma.getmaskarray(arr)
+    if arr.ndim == 2:
+        norm = colors.Normalize(vmin=arr.min(), vmax=arr.max())
+        rgba = colormaps[style.get("cmap", "viridis")](norm(arr), bytes=True)
+    else:
+        bands = []
+        for band in arr:
+            if band.dtype != np.uint8:
+                band = colors.Normalize(vmin=band.min(), vmax=band.max())(band) * 255
+            bands.append(np.ma.filled(band, 0).astype(np.uint8))
+        alpha = np.where(mask.any(axis=0), 0, 255).astype(np.uint8)
+        rgba = np.dstack([*bands, alpha])
+
+    buf = io.BytesIO()
+    Image.fromarray(rgba, "RGBA").save(buf, format="PNG", compress_level=3)
+    url = "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+
+    height, width = arr.shape[-2:]
+    west, south, east, north = transform_bounds(
+        "EPSG:3857", "EPSG:4326", *array_bounds(height, width, transform)
+    )
+    return folium.raster_layers.ImageOverlay(
+        image=url,
+        bounds=[[south, west], [north, east]],
+        opacity=style.get("opacity", 0.7),
+        name=label,
+    )
+
 
 @gis_mcp.tool()
 def create_web_map(
@@ -23,6 +140,10 @@ def create_web_map(
     add_legend: bool = True,
     basemap: str = "OpenStreetMap",
     add_minimap: bool = True,
+    tooltip_fields: list = None,
+    bbox: list = None,
+    max_tooltip_fields: int = 5,
+    compress: bool = False,
 ):
     """
     Create an interactive web map (HTML) using Folium.
@@ -33,32 +154,67 @@ def create_web_map(
             - "style" may include:
                 {"label": "Layer Name", "color": "blue"}
                 {"column": "NAME_1", "cmap": "tab20"}  # for unique feature colors
+                {"cmap": "terrain", "opacity": 0.6}  # for .tif rasters
         filename (str): Output HTML filename.
         title (str): Main map title.
         output_dir (str): Output directory for HTML.
+        tooltip_fields (list): Attribute columns to keep for tooltips. Other
+            columns are dropped from the embedded GeoJSON. Defaults to the
+            first max_tooltip_fields columns that have at least one non-null value.
+        bbox (list): Optional [minx, miny, maxx, maxy] in the layers' CRS. Only
+            features of vector file, WKT and GeoDataFrame layers intersecting
+            it are read and drawn; raster overlays are not clipped.
+        max_tooltip_fields (int): Number of columns picked for tooltips when
+            tooltip_fields is not given. 0 disables tooltips.
+        compress (bool): Write gzip-compressed HTML to "<filename>.gz" instead.
+            Useful for large layers served by a web server with gzip encoding.
     """
     try:
         m = folium.Map(location=[20, 0], zoom_start=2, tiles=basemap)
         legend_items = []
 
-        for layer in layers:
+        # File reads are I/O bound and GDAL releases the GIL, so load them
+        # concurrently; folium objects are then built in layer order.
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_READ_WORKERS, len(layers)))) as pool:
+            loaded = list(pool.map(lambda layer: _read_layer_file(layer, tooltip_fields, bbox), layers))
+
+        for layer, file_data in zip(layers, loaded):
             data = layer.get("data")
             style = layer.get("style", {})
             label = style.get("label", "Layer")
 
+            if isinstance(data, str) and data.lower().endswith((".tif", ".tiff")):
+                _raster_overlay(*file_data, style, label).add_to(m)
+                continue
+
             if isinstance(data, str):
                 data = os.path.abspath(data)
                 if data.lower().endswith((".shp", ".geojson")):
-                    gdf = gpd.read_file(data)
+                    gdf = file_data
                 else:
                     geom = wkt.loads(data)
                     gdf = gpd.GeoDataFrame(geometry=[geom], crs="EPSG:4326")
+                    if bbox is not None:
+                        gdf = gdf.cx[bbox[0]:bbox[2], bbox[1]:bbox[3]]
             elif isinstance(data, gpd.GeoDataFrame):
                 gdf = data
+                if bbox is not None:
+                    gdf = gdf.cx[bbox[0]:bbox[2], bbox[1]:bbox[3]]
             else:
                 raise ValueError(f"Unsupported data type for {data}")
 
-            fields = [c for c in gdf.columns if c != gdf.geometry.name]
+            # Nothing to draw (e.g. no features inside bbox); folium's tooltip
+            # validation would also fail on an empty FeatureCollection.
+            if gdf.empty:
+                continue
+
+            if tooltip_fields is not None:
+                fields = [c for c in tooltip_fields if c in gdf.columns]
+            else:
+                fields = [
+                    c for c in gdf.columns
+                    if c != gdf.geometry.name and gdf[c].notna().any()
+                ][:max_tooltip_fields]
 
             if "column" in style:
                 column = style["column"]
@@ -81,7 +237,7 @@ def create_web_map(
                     }
 
                 gj = folium.GeoJson(
-                    gdf,
+                    _to_geojson(gdf[[column, gdf.geometry.name]]),
                     name=label,
                     style_function=style_func,
                     tooltip=folium.GeoJsonTooltip(fields=[column], aliases=[column]),
@@ -93,16 +249,19 @@ def create_web_map(
             else:
                 color = style.get("color", "blue")
                 gj = folium.GeoJson(
-                    gdf,
+                    _to_geojson(gdf[[*fields, gdf.geometry.name]]),
                     name=label,
-                    style_function=lambda x, col=color: {
-                        "color": col,
-                        "fillColor": col,
+                    # A constant style is passed straight to Leaflet; a style_function
+                    # would be evaluated in Python for every feature.
+                    style={
+                        "color": color,
+                        "fillColor": color,
                         "weight": 2,
                         "fillOpacity": 0.5,
                     },
-                    tooltip=folium.GeoJsonTooltip(fields=fields, aliases=fields) if fields else None,
                 )
+                if fields:
+                    folium.GeoJsonTooltip(fields=fields, aliases=fields).add_to(gj)
                 gj.add_to(m)
                 legend_items.append((label, color))
 
@@ -116,49 +275,23 @@ def create_web_map(
 
         # Legend
         if add_legend and legend_items:
-            legend_html = """
-            <div style="
-                position: fixed; 
-                bottom: 50px; left: 50px; width: 220px; 
-                background-color: white; 
-                border:2px solid grey; 
-                z-index:9999; 
-                font-size:14px;
-                padding: 10px;
-                max-height: 300px;
-                overflow-y: auto;
-            ">
-            <b>Legend</b><br>
-            """
-            for label, color in legend_items:
-                legend_html += f"<i style='background:{color};width:18px;height:18px;float:left;margin-right:8px;'></i>{label}<br>"
-            legend_html += "</div>"
+            rows = [_LEGEND_ROW_TPL.substitute(color=color, label=label) for label, color in legend_items]
+            legend_html = _LEGEND_HEAD + "".join(rows) + _LEGEND_TAIL
             m.get_root().html.add_child(folium.Element(legend_html))
 
         # Title
         if title:
-            title_html = f"""
-                <div id="mapTitle" style="
-                    position: fixed;
-                    top: 10px;
-                    left: 50%;
-                    transform: translateX(-50%);
-                    z-index: 9999;
-                    font-size: 20px;
-                    font-weight: bold;
-                    background-color: rgba(255, 255, 255, 0.7);
-                    padding: 5px 10px;
-                    border-radius: 5px;
-                    text-align: center;
-                ">
-                    {title}
-                </div>
-            """
-            m.get_root().html.add_child(folium.Element(title_html))
+            m.get_root().html.add_child(folium.Element(_TITLE_TPL.substitute(title=title)))
 
         os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.abspath(os.path.join(output_dir, filename))
-        m.save(output_path)
+        if compress:
+            if not output_path.endswith(".gz"):
+                output_path += ".gz"
+            with gzip.open(output_path, "wt", encoding="utf-8", compresslevel=3) as f:
+                f.write(m.get_root().render())
+        else:
+            m.save(output_path)
 
         return {"status": "success", "message": f"Map created: {output_path}", "output_path": output_path}
 
@@ -0,0 +1,78 @@
+import geopandas as gpd
+import pytest
+from PIL import Image
+from shapely.geometry import Polygon, box
+
+from gis_mcp.visualize.map_tool import _get_axes, _simplify_for_display, create_map
+
+create_map = getattr(create_map, "fn", create_map)
+
+
+@pytest.fixture
+def polygons():
+    return gpd.GeoDataFrame(
+        {"val": [1, 2]},
+        geometry=[Polygon([(0, 0), (4, 0), (4, 1)]), Polygon([(0, 1), (4, 1), (4, 2)])],
+        crs="EPSG:4326",
+    )
+
+
+def test_colorbar_does_not_leak_into_later_maps(tmp_path, polygons):
+    def plain_map_size(name):
+        result = create_map([{"data": polygons}], filename=name, output_dir=str(tmp_path))
+        assert result["status"] == "success"
+        return Image.open(result["output_path"]).size
+
+    before = plain_map_size("before")
+    result = create_map(
+        [{"data": polygons, "style": {"column": "val", "legend": True}}],
+        filename="colorbar",
+        output_dir=str(tmp_path),
+    )
+    assert result["status"] == "success"
+    assert plain_map_size("after") == before
+
+
+@pytest.mark.parametrize("filetype", ["png", "jpg"])
+def test_long_title_is_not_cropped_to_canvas(tmp_path, polygons, filetype):
+    result = create_map(
+        [{"data": polygons}],
+        filename="long_title",
+        filetype=filetype,
+        title="A very long map title " * 10,
+        output_dir=str(tmp_path),
+    )
+    assert result["status"] == "success"
+    # The 10 in wide canvas is 3000 px at 300 dpi; the title extends past it.
+    assert Image.open(result["output_path"]).size[0] > 3000
+
+
+@pytest.mark.parametrize("compress_level", [3, 9])
+def test_png_records_dpi(tmp_path, polygons, compress_level):
+    result = create_map(
+        [{"data": polygons}], filename="dpi", output_dir=str(tmp_path), compress_level=compress_level
+    )
+    assert result["status"] == "success"
+    assert Image.open(result["output_path"]).info["dpi"] == pytest.approx((300, 300), abs=0.01)
+
+
+def test_simplify_keeps_subpixel_polygons(tmp_path):
+    boxes = [box(i, 0, i + 0.02, 0.02) for i in range(0, 100, 2)]
+    strip = box(0, 10, 100, 10.5)
+    gdf = gpd.GeoDataFrame(geometry=[*boxes, strip], crs="EPSG:4326")
+
+    fig, ax = _get_axes()
+    simplified = _simplify_for_display(gdf, ax, dpi=300)
+    assert (~simplified.geometry.is_empty).sum() == len(gdf)
+
+    sizes = {}
+    for simplify in (True, False):
+        result = create_map(
+            [{"data": gdf, "style": {"color": "red", "edgecolor": "red"}}],
+            filename=f"simplify_{simplify}",
+            output_dir=str(tmp_path),
+            simplify=simplify,
+        )
+        assert result["status"] == "success"
+        sizes[simplify] = Image.open(result["output_path"]).size
+    assert sizes[True] == sizes[False]
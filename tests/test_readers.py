@@ -0,0 +1,24 @@
+import os
+import shutil
+
+import geopandas as gpd
+from shapely.geometry import Point
+
+from gis_mcp.visualize.readers import read_vector
+
+
+def test_shapefile_dbf_edit_invalidates_cache(tmp_path):
+    gdf = gpd.GeoDataFrame({"name": ["a", "b"]}, geometry=[Point(0, 0), Point(1, 1)], crs="EPSG:4326")
+    path = str(tmp_path / "points.shp")
+    gdf.to_file(path)
+    assert read_vector(path)["name"].tolist() == ["a", "b"]
+
+    # Rewrite only the .dbf, leaving the .shp and its mtime untouched.
+    shp_mtime = os.path.getmtime(path)
+    gdf.assign(name=["x", "y"]).to_file(str(tmp_path / "renamed.shp"))
+    shutil.copy(tmp_path / "renamed.dbf", tmp_path / "points.dbf")
+    dbf_mtime = shp_mtime + 10
+    os.utime(path, (shp_mtime, shp_mtime))
+    os.utime(tmp_path / "points.dbf", (dbf_mtime, dbf_mtime))
+
+    assert read_vector(path)["name"].tolist() == ["x", "y"]
@@ -0,0 +1,29 @@
+import base64
+import io
+
+import numpy as np
+import rasterio
+from PIL import Image
+from rasterio.transform import from_origin
+
+from gis_mcp.visualize.readers import read_raster
+from gis_mcp.visualize.web_map_tool import _raster_overlay
+
+
+def test_reprojected_raster_without_nodata_masks_warp_fill(tmp_path):
+    path = str(tmp_path / "utm.tif")
+    with rasterio.open(
+        path, "w", driver="GTiff", width=500, height=500, count=1, dtype="uint8",
+        crs="EPSG:32633", transform=from_origin(200000, 6000000, 100, 100),
+    ) as dst:
+        dst.write(np.full((1, 500, 500), 100, dtype=np.uint8))
+
+    arr, transform = read_raster(path, crs="EPSG:3857")
+    overlay = _raster_overlay(arr, transform, {}, "utm")
+
+    png = base64.b64decode(overlay.url.split(",", 1)[1])
+    alpha = np.asarray(Image.open(io.BytesIO(png)).convert("RGBA"))[..., 3]
+    # The grid is rotated in Web Mercator, so the warp leaves fill in the corners.
+    assert alpha[0, 0] == 0
+    assert alpha[-1, -1] == 0
+    assert alpha[alpha.shape[0] // 2, alpha.shape[1] // 2] == 255